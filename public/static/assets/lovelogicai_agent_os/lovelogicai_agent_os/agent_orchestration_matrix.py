@@ -9,17 +9,31 @@ Core Innovation: Intelligent Agent Selection and Coordination
 """
 
 import asyncio
+import hashlib
+import heapq
+import itertools
 import json
+import math
+import random
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable, Union
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Callable, Union, Tuple, Set, FrozenSet
+from dataclasses import dataclass, asdict, replace
+from collections import OrderedDict, defaultdict
 from enum import Enum
 import logging
 from abc import ABC, abstractmethod
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the scoring kernel then runs as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -57,7 +71,12 @@ class OrchestrationStrategy(Enum):
     ADAPTIVE = "adaptive"
     COLLABORATIVE = "collaborative"
 
-@dataclass
+# Enum values interned once for hot paths
+_AGENT_TYPE_STR = {t: t.value for t in AgentType}
+_AGENT_STATE_STR = {s: s.value for s in AgentState}
+_TASK_PRIORITY_RANK = {p: -p.value for p in TaskPriority}
+
+@dataclass(slots=True, frozen=True)
 class AgentCapability:
     name: str
     description: str
@@ -67,12 +86,12 @@ class AgentCapability:
     execution_time_estimate: float  # in seconds
     resource_requirements: Dict[str, Any]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Task:
     id: str
     description: str
     input_data: Any
-    required_capabilities: List[str]
+    required_capabilities: FrozenSet[str]  # any iterable is accepted and frozen on construction
     priority: TaskPriority
     deadline: Optional[datetime]
     context: Dict[str, Any]
@@ -80,7 +99,11 @@ class Task:
     created_at: datetime
     user_id: str
 
-@dataclass
+    def __post_init__(self):
+        if not isinstance(self.required_capabilities, frozenset):
+            object.__setattr__(self, 'required_capabilities', frozenset(self.required_capabilities))
+
+@dataclass(slots=True, frozen=True)
 class AgentResponse:
     agent_id: str
     task_id: str
@@ -92,6 +115,37 @@ class AgentResponse:
     metadata: Dict[str, Any]
     timestamp: datetime
 
+    @classmethod
+    def success_from(cls, task: Task, agent_id: str, output: Any, elapsed: float, confidence: float,
+                     metadata: Dict[str, Any], timestamp: Optional[datetime] = None) -> "AgentResponse":
+        """Build the response for a task that completed successfully"""
+        return cls(agent_id, task.id, True, output, confidence, elapsed, None,
+                   metadata, timestamp or datetime.now())
+
+    @classmethod
+    def failure_from(cls, task: Task, agent_id: str, error_message: str, elapsed: float,
+                     metadata: Dict[str, Any], timestamp: Optional[datetime] = None) -> "AgentResponse":
+        """Build the response for a task that failed or timed out"""
+        return cls(agent_id, task.id, False, None, 0.0, elapsed, error_message,
+                   metadata, timestamp or datetime.now())
+
+@njit(cache=True, fastmath=True)
+def _score_and_pick(slots, confidence, success_rate, load_factor):
+    """Return the slot with the best composite score among candidates, or -1 if none can handle the task"""
+    best_slot = -1
+    best_score = 0.0
+    for i in range(slots.shape[0]):
+        slot = slots[i]
+        conf = confidence[slot]
+        if conf <= 0.0:
+            continue
+        # Composite score: confidence * 0.5 + success rate * 0.3 + (1 - load) * 0.2
+        score = 0.5 * conf + 0.3 * success_rate[slot] + 0.2 - 0.2 * load_factor[slot]
+        if best_slot == -1 or score > best_score:
+            best_slot = slot
+            best_score = score
+    return best_slot
+
 class BaseAgent(ABC):
     """Abstract base class for all AI agents"""
 
@@ -99,57 +153,97 @@ class BaseAgent(ABC):
         self.agent_id = agent_id
         self.agent_type = agent_type
         self.capabilities = capabilities
+        self._capability_set = frozenset(cap.name for cap in capabilities)
+        # Status dict reused by get_status until state, load or current task changes
+        self._status_cache: Optional[Dict[str, Any]] = None
+        # Called with the agent on every state transition (set by the orchestration matrix)
+        self.state_listener: Optional[Callable[["BaseAgent"], None]] = None
         self.state = AgentState.IDLE
         self.current_task = None
-        self.performance_metrics = {
-            'tasks_completed': 0,
-            'success_rate': 1.0,
-            'average_execution_time': 0.0,
-            'last_active': datetime.now()
-        }
+        # Raw performance counters; rates and averages are derived when read
+        self.tasks_completed = 0
+        self.successes = 0
+        self.total_execution_time = 0.0
+        self.last_active = datetime.now()
         self.load_factor = 0.0  # 0.0 to 1.0
 
+    @property
+    def state(self) -> AgentState:
+        return self._state
+
+    @state.setter
+    def state(self, value: AgentState):
+        self._state = value
+        self._status_cache = None
+        if self.state_listener is not None:
+            self.state_listener(self)
+
+    @property
+    def current_task(self) -> Optional[Task]:
+        return self._current_task
+
+    @current_task.setter
+    def current_task(self, value: Optional[Task]):
+        self._current_task = value
+        self._status_cache = None
+
+    @property
+    def load_factor(self) -> float:
+        return self._load_factor
+
+    @load_factor.setter
+    def load_factor(self, value: float):
+        self._load_factor = value
+        self._status_cache = None
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.tasks_completed if self.tasks_completed else 1.0
+
+    @property
+    def performance_metrics(self) -> Dict[str, Any]:
+        """Agent performance metrics derived from the raw counters"""
+        return {
+            'tasks_completed': self.tasks_completed,
+            'success_rate': self.success_rate,
+            'average_execution_time': (
+                self.total_execution_time / self.tasks_completed if self.tasks_completed else 0.0
+            ),
+            'last_active': self.last_active
+        }
+
     @abstractmethod
     async def execute_task(self, task: Task) -> AgentResponse:
         """Execute a task and return response"""
         pass
 
     @abstractmethod
-    async def can_handle_task(self, task: Task) -> float:
+    def can_handle_task(self, task: Task) -> float:
         """Return confidence score (0.0-1.0) for handling this task"""
         pass
 
     async def get_status(self) -> Dict[str, Any]:
         """Get current agent status"""
-        return {
-            'agent_id': self.agent_id,
-            'agent_type': self.agent_type.value,
-            'state': self.state.value,
-            'load_factor': self.load_factor,
-            'capabilities': [cap.name for cap in self.capabilities],
-            'performance_metrics': self.performance_metrics,
-            'current_task': self.current_task.id if self.current_task else None
-        }
+        if self._status_cache is None:
+            self._status_cache = {
+                'agent_id': self.agent_id,
+                'agent_type': _AGENT_TYPE_STR[self.agent_type],
+                'state': _AGENT_STATE_STR[self.state],
+                'load_factor': self.load_factor,
+                'capabilities': [cap.name for cap in self.capabilities],
+                'performance_metrics': self.performance_metrics,
+                'current_task': self.current_task.id if self.current_task else None
+            }
+        return self._status_cache
 
     def update_performance_metrics(self, response: AgentResponse):
         """Update agent performance metrics"""
-        self.performance_metrics['tasks_completed'] += 1
-        self.performance_metrics['last_active'] = datetime.now()
-
-        # Update success rate
-        total_tasks = self.performance_metrics['tasks_completed']
+        self._status_cache = None
+        self.tasks_completed += 1
         if response.success:
-            current_successes = self.performance_metrics['success_rate'] * (total_tasks - 1)
-            self.performance_metrics['success_rate'] = (current_successes + 1) / total_tasks
-        else:
-            current_successes = self.performance_metrics['success_rate'] * (total_tasks - 1)
-            self.performance_metrics['success_rate'] = current_successes / total_tasks
-
-        # Update average execution time
-        current_avg = self.performance_metrics['average_execution_time']
-        self.performance_metrics['average_execution_time'] = (
-            (current_avg * (total_tasks - 1) + response.execution_time) / total_tasks
-        )
+            self.successes += 1
+        self.total_execution_time += response.execution_time
+        self.last_active = response.timestamp
 
 class VoiceAgent(BaseAgent):
     """Specialized agent for voice processing and speech tasks"""
@@ -188,7 +282,7 @@ class VoiceAgent(BaseAgent):
 
     async def execute_task(self, task: Task) -> AgentResponse:
         """Execute voice-related task"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.state = AgentState.ACTIVE
         self.current_task = task
 
@@ -210,31 +304,15 @@ class VoiceAgent(BaseAgent):
             else:
                 raise ValueError(f"Unsupported capability: {task.required_capabilities}")
 
-            execution_time = time.time() - start_time
-            response = AgentResponse(
-                agent_id=self.agent_id,
-                task_id=task.id,
-                success=True,
-                output=output,
-                confidence=0.85,
-                execution_time=execution_time,
-                error_message=None,
-                metadata={"agent_type": "voice"},
-                timestamp=datetime.now()
+            execution_time = time.perf_counter() - start_time
+            response = AgentResponse.success_from(
+                task, self.agent_id, output, execution_time, 0.85, {"agent_type": "voice"}
             )
 
         except Exception as e:
-            execution_time = time.time() - start_time
-            response = AgentResponse(
-                agent_id=self.agent_id,
-                task_id=task.id,
-                success=False,
-                output=None,
-                confidence=0.0,
-                execution_time=execution_time,
-                error_message=str(e),
-                metadata={"agent_type": "voice", "error": str(e)},
-                timestamp=datetime.now()
+            execution_time = time.perf_counter() - start_time
+            response = AgentResponse.failure_from(
+                task, self.agent_id, str(e), execution_time, {"agent_type": "voice", "error": str(e)}
             )
 
         finally:
@@ -244,14 +322,11 @@ class VoiceAgent(BaseAgent):
 
         return response
 
-    async def can_handle_task(self, task: Task) -> float:
+    def can_handle_task(self, task: Task) -> float:
         """Check if this agent can handle the task"""
-        voice_capabilities = {"speech_to_text", "text_to_speech", "voice_analysis"}
-        required_caps = set(task.required_capabilities)
-
-        if required_caps.intersection(voice_capabilities):
-            return 0.9  # High confidence for voice tasks
-        return 0.0
+        if self._capability_set.isdisjoint(task.required_capabilities):
+            return 0.0
+        return 0.9  # High confidence for voice tasks
 
 class AgentOrchestrationMatrix:
     """
@@ -261,39 +336,230 @@ class AgentOrchestrationMatrix:
     for complex task execution and workflow automation.
     """
 
-    def __init__(self):
+    def __init__(self, max_concurrent_tasks: int = 10, max_completed_tasks: int = 10000,
+                 result_cache_ttl: float = 3600.0, result_cache_max_entries: int = 10000):
         self.agents: Dict[str, BaseAgent] = {}
-        self.task_queue: List[Task] = []
+        self._capability_types: Dict[str, AgentType] = {}
+        # Capability name -> agents declaring it, and the idle agents of each type
+        self._cap_index: Dict[str, List[BaseAgent]] = defaultdict(list)
+        self._idle_by_type: Dict[AgentType, Set[BaseAgent]] = defaultdict(set)
+        # Scoring inputs as parallel arrays (one slot per registered agent)
+        self._agent_slots: Dict[str, int] = {}
+        self._slot_agents: List[BaseAgent] = []
+        self._success_rate = np.empty(0, dtype=np.float32)
+        self._load_factor = np.empty(0, dtype=np.float32)
+        self._last_confidence = np.empty(0, dtype=np.float32)
+        # One min-heap of (-priority, deadline_ts, seq, task) per agent type; seq keeps FIFO order on ties.
+        # Tasks no registered agent can route sit under the None key, reachable only by stealing.
+        self.run_queues: Dict[Optional[AgentType], List[Tuple[int, float, int, Task]]] = defaultdict(list)
+        self._task_seq = itertools.count()
+        # Tasks waiting on dependencies that have not completed yet
+        self._blocked_tasks: Dict[str, Task] = {}
+        self._pending_deps: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = defaultdict(set)
         self.active_tasks: Dict[str, Task] = {}
-        self.completed_tasks: Dict[str, AgentResponse] = {}
+        # Min-heap of (deadline_ts, task_id) for active tasks that have a deadline
+        self._deadline_heap: List[Tuple[float, str]] = []
+        # Heap entries whose task already finished; swept once they are half the heap
+        self._stale_deadlines = 0
+        # asdict() of active tasks, built on the first status poll and reused until completion
+        self._task_dicts: Dict[str, Dict[str, Any]] = {}
+        # Most recent responses only; the oldest are evicted past max_completed_tasks
+        self.completed_tasks: "OrderedDict[str, AgentResponse]" = OrderedDict()
+        self._max_completed_tasks = max_completed_tasks
+        # Ids of completions evicted above, so later tasks can still depend on them; kept to
+        # ten times the response bound since an id costs far less than a response
+        self._evicted_task_ids: "OrderedDict[str, None]" = OrderedDict()
         self.orchestration_metrics = {
             'total_tasks': 0,
             'successful_tasks': 0,
             'failed_tasks': 0,
             'average_completion_time': 0.0,
+            'cache_hits': 0,
             'agent_utilization': {}
         }
+        # LRU of task hash -> (stored_at, response) for successful executions
+        self._result_cache: "OrderedDict[str, Tuple[float, AgentResponse]]" = OrderedDict()
+        self._ttl_seconds = result_cache_ttl
+        self._cache_max_entries = result_cache_max_entries
         self.is_running = False
-        self.executor = ThreadPoolExecutor(max_workers=10)
+        # Bounds concurrent agent executions; handles are kept so shutdown can drain them
+        self._sem = asyncio.Semaphore(max_concurrent_tasks)
+        self._inflight: Set[asyncio.Task] = set()
+        # Set whenever there may be scheduling work: submissions, completions, new agents
+        self._wake = asyncio.Event()
 
     def register_agent(self, agent: BaseAgent):
         """Register a new agent with the orchestration matrix"""
+        previous = self.agents.get(agent.agent_id)
+        if previous is not None:
+            self._unindex_agent(previous)
         self.agents[agent.agent_id] = agent
+        if agent.agent_id in self._agent_slots:
+            self._slot_agents[self._agent_slots[agent.agent_id]] = agent
+        else:
+            self._agent_slots[agent.agent_id] = len(self._slot_agents)
+            self._slot_agents.append(agent)
+            self._success_rate = np.append(self._success_rate, np.float32(0.0))
+            self._load_factor = np.append(self._load_factor, np.float32(0.0))
+            self._last_confidence = np.append(self._last_confidence, np.float32(0.0))
+        for cap in agent.capabilities:
+            self._capability_types.setdefault(cap.name, agent.agent_type)
+            self._cap_index[cap.name].append(agent)
+        agent.state_listener = self._on_agent_state_change
+        self._on_agent_state_change(agent)
         self.orchestration_metrics['agent_utilization'][agent.agent_id] = 0.0
-        logger.info(f"Registered agent: {agent.agent_id} ({agent.agent_type.value})")
+        logger.info(f"Registered agent: {agent.agent_id} ({_AGENT_TYPE_STR[agent.agent_type]})")
+        self._wake.set()
+
+    def _unindex_agent(self, agent: BaseAgent):
+        """Detach an agent being replaced under the same id from the scheduling indexes"""
+        agent.state_listener = None
+        self._idle_by_type[agent.agent_type].discard(agent)
+        for cap in agent.capabilities:
+            holders = self._cap_index.get(cap.name)
+            if holders is None:
+                continue
+            if agent in holders:
+                holders.remove(agent)
+            if not holders:
+                del self._cap_index[cap.name]
+                self._capability_types.pop(cap.name, None)
 
     async def submit_task(self, task: Task) -> str:
         """Submit a task for execution"""
-        self.task_queue.append(task)
+        unmet_deps = {
+            dep for dep in task.dependencies
+            if dep not in self.completed_tasks and dep not in self._evicted_task_ids
+        }
+        if unmet_deps:
+            self._block_task(task, unmet_deps)
+        else:
+            self._enqueue_task(task)
         self.orchestration_metrics['total_tasks'] += 1
         logger.info(f"Task submitted: {task.id} - {task.description}")
 
         # Start orchestration if not running
+        self._wake.set()
         if not self.is_running:
-            asyncio.create_task(self._orchestration_loop())
+            self.is_running = True
+            self._loop_task = asyncio.create_task(self._orchestration_loop())
 
         return task.id
 
+    def _on_agent_state_change(self, agent: BaseAgent):
+        """Keep the idle index and scoring arrays in step with an agent's state"""
+        if agent.state == AgentState.IDLE:
+            self._idle_by_type[agent.agent_type].add(agent)
+        else:
+            self._idle_by_type[agent.agent_type].discard(agent)
+        self._sync_agent_scores(agent)
+
+    def _sync_agent_scores(self, agent: BaseAgent):
+        """Copy an agent's success rate and load into its scoring slot"""
+        slot = self._agent_slots[agent.agent_id]
+        self._success_rate[slot] = agent.success_rate
+        self._load_factor[slot] = agent.load_factor
+
+    def _candidate_agents(self, task: Task, agent_type: AgentType) -> Set[BaseAgent]:
+        """Idle agents of a type that declare at least one of the task's capabilities"""
+        idle = self._idle_by_type[agent_type]
+        if not idle:
+            return set()
+
+        candidates = set()
+        for capability in task.required_capabilities:
+            candidates.update(self._cap_index.get(capability, ()))
+        return candidates & idle
+
+    def _route_task(self, task: Task) -> Optional[AgentType]:
+        """Pick the run queue for a task from the agent type owning its capabilities"""
+        for capability in sorted(task.required_capabilities):
+            agent_type = self._capability_types.get(capability)
+            if agent_type is not None:
+                return agent_type
+        # No registered agent declares these capabilities; park it where only stealing looks
+        return None
+
+    def _enqueue_task(self, task: Task):
+        """Push a task whose dependencies are satisfied onto its run queue"""
+        # Tasks without a deadline sort after every dated task of the same priority
+        deadline_ts = task.deadline.timestamp() if task.deadline else math.inf
+        heapq.heappush(
+            self.run_queues[self._route_task(task)],
+            (_TASK_PRIORITY_RANK[task.priority], deadline_ts, next(self._task_seq), task)
+        )
+
+    def _queued_count(self) -> int:
+        """Number of tasks waiting in all run queues"""
+        return sum(len(queue) for queue in self.run_queues.values())
+
+    def _block_task(self, task: Task, unmet_deps: Set[str]):
+        """Hold a task back until all of its dependencies have completed"""
+        self._blocked_tasks[task.id] = task
+        self._pending_deps[task.id] = unmet_deps
+        for dep in unmet_deps:
+            self._dependents[dep].add(task.id)
+
+        cycle = self._find_dependency_cycle(task.id)
+        if cycle:
+            # Tasks in a dependency cycle can never become ready; schedule them by priority alone
+            logger.warning(f"Dependency cycle detected, ignoring dependencies for: {cycle}")
+            for task_id in cycle:
+                self._unblock_task(task_id)
+
+    def _find_dependency_cycle(self, task_id: str) -> Optional[List[str]]:
+        """Return the blocked tasks on a dependency cycle through task_id, if there is one"""
+        # The graph was acyclic before this task was blocked, so any new cycle passes through it,
+        # and only if some blocked task already waits on it
+        if task_id not in self._dependents:
+            return None
+
+        parents: Dict[str, str] = {}
+        stack = [task_id]
+        while stack:
+            node = stack.pop()
+            for dep in self._pending_deps.get(node, ()):
+                if dep == task_id:
+                    cycle = [node]
+                    while node != task_id:
+                        node = parents[node]
+                        cycle.append(node)
+                    return cycle[::-1]
+                if dep not in parents and dep in self._pending_deps:
+                    parents[dep] = node
+                    stack.append(dep)
+        return None
+
+    def _unblock_task(self, task_id: str):
+        """Move a blocked task onto the run queue"""
+        for dep in self._pending_deps.pop(task_id, ()):
+            waiting = self._dependents.get(dep)
+            if waiting is not None:
+                waiting.discard(task_id)
+                if not waiting:
+                    del self._dependents[dep]
+        self._enqueue_task(self._blocked_tasks.pop(task_id))
+
+    def _record_completion(self, task_id: str, response: AgentResponse):
+        """Store a task's final response and release tasks that depended on it"""
+        self.completed_tasks[task_id] = response
+        self.completed_tasks.move_to_end(task_id)
+        if len(self.completed_tasks) > self._max_completed_tasks:
+            evicted_id, _ = self.completed_tasks.popitem(last=False)
+            self._evicted_task_ids[evicted_id] = None
+            if len(self._evicted_task_ids) > self._max_completed_tasks * 10:
+                self._evicted_task_ids.popitem(last=False)
+        self._task_dicts.pop(task_id, None)
+
+        for dependent_id in self._dependents.pop(task_id, ()):
+            pending = self._pending_deps.get(dependent_id)
+            if pending is None:
+                continue
+            pending.discard(task_id)
+            if not pending:
+                self._unblock_task(dependent_id)
+
     async def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """Get the status of a specific task"""
         if task_id in self.completed_tasks:
@@ -306,18 +572,28 @@ class AgentOrchestrationMatrix:
                 'agent_id': response.agent_id
             }
         elif task_id in self.active_tasks:
+            task_dict = self._task_dicts.get(task_id)
+            if task_dict is None:
+                task_dict = self._task_dicts[task_id] = asdict(self.active_tasks[task_id])
             return {
                 'status': 'active',
-                'task': asdict(self.active_tasks[task_id])
+                'task': task_dict
+            }
+        elif task_id in self._blocked_tasks:
+            return {
+                'status': 'blocked',
+                'waiting_on': sorted(self._pending_deps[task_id])
             }
         else:
-            # Check if in queue
-            for task in self.task_queue:
-                if task.id == task_id:
-                    return {
-                        'status': 'queued',
-                        'position': self.task_queue.index(task)
-                    }
+            # Check if in a run queue; heap order is not rank order, so count entries ahead of it
+            for agent_type, queue in self.run_queues.items():
+                for entry in queue:
+                    if entry[3].id == task_id:
+                        return {
+                            'status': 'queued',
+                            'queue': _AGENT_TYPE_STR[agent_type] if agent_type else 'unrouted',
+                            'position': sum(1 for other in queue if other[:3] < entry[:3])
+                        }
             return {'status': 'not_found'}
 
     async def _orchestration_loop(self):
@@ -326,155 +602,225 @@ class AgentOrchestrationMatrix:
         logger.info("🚀 Agent Orchestration Matrix started")
 
         try:
-            while self.task_queue or self.active_tasks:
+            while self._queued_count() or self.active_tasks:
+                now = datetime.now()
+
                 # Process queued tasks
-                if self.task_queue:
-                    await self._process_task_queue()
+                self._process_task_queue()
 
                 # Check active tasks
-                await self._monitor_active_tasks()
-
-                # Brief pause to prevent busy waiting
-                await asyncio.sleep(0.1)
+                await self._monitor_active_tasks(now)
+
+                # Sleep until a submission or completion, or until the next deadline is due
+                timeout = None
+                if self._deadline_heap:
+                    timeout = max(0.0, self._deadline_heap[0][0] - time.time())
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
 
         finally:
             self.is_running = False
             logger.info("🛑 Agent Orchestration Matrix stopped")
 
-    async def _process_task_queue(self):
-        """Process tasks in the queue"""
-        if not self.task_queue:
+    def _process_task_queue(self):
+        """Process tasks in the run queues"""
+        for agent_type, idle_agents in list(self._idle_by_type.items()):
+            if not idle_agents:
+                continue
+
+            queue = self.run_queues[agent_type]
+            if not queue:
+                self._steal_tasks(agent_type)
+
+            # Assign in priority order while idle agents remain; tasks no idle agent can take
+            # are set aside so they do not hold back assignable tasks behind them
+            skipped = []
+            while queue and idle_agents:
+                entry = heapq.heappop(queue)
+                if not self._assign_task_to_agent(entry[3], agent_type):
+                    skipped.append(entry)
+            for entry in skipped:
+                heapq.heappush(queue, entry)
+
+    def _steal_tasks(self, agent_type: AgentType):
+        """Move half of the first victim queue's tasks that this type's idle agents can handle onto its own queue"""
+        victims = [t for t, queue in self.run_queues.items() if queue and t != agent_type]
+        if not victims:
             return
 
-        # Sort tasks by priority and deadline
-        self.task_queue.sort(key=lambda t: (t.priority.value, t.deadline or datetime.max), reverse=True)
+        # Start at a random victim to spread stealing, but keep scanning until one yields work
+        start = random.randrange(len(victims))
+        for offset in range(len(victims)):
+            victim = self.run_queues[victims[(start + offset) % len(victims)]]
+            stealable = [entry for entry in victim if self._candidate_agents(entry[3], agent_type)]
+            if stealable:
+                break
+        else:
+            return
 
-        # Try to assign tasks to available agents
-        tasks_to_remove = []
-        for task in self.task_queue:
-            if await self._assign_task_to_agent(task):
-                tasks_to_remove.append(task)
+        # Take the lower-priority half so the victim keeps its own head of queue
+        stealable.sort()
+        stolen = stealable[len(stealable) // 2:]
+        stolen_seqs = {entry[2] for entry in stolen}
+        victim[:] = [entry for entry in victim if entry[2] not in stolen_seqs]
+        heapq.heapify(victim)
 
-        # Remove assigned tasks from queue
-        for task in tasks_to_remove:
-            self.task_queue.remove(task)
+        queue = self.run_queues[agent_type]
+        queue.extend(stolen)
+        heapq.heapify(queue)
 
-    async def _assign_task_to_agent(self, task: Task) -> bool:
-        """Assign a task to the best available agent"""
-        best_agent = await self._select_best_agent(task)
+    def _assign_task_to_agent(self, task: Task, agent_type: AgentType) -> bool:
+        """Assign a task to the best available agent of the given type"""
+        best_agent = self._select_best_agent(task, agent_type)
 
         if best_agent and best_agent.state == AgentState.IDLE:
-            # Assign task to agent
+            # Reserve the agent so it drops out of the idle index until it finishes
+            best_agent.state = AgentState.BUSY
             self.active_tasks[task.id] = task
+            if task.deadline:
+                heapq.heappush(self._deadline_heap, (task.deadline.timestamp(), task.id))
 
             # Execute task asynchronously
-            asyncio.create_task(self._execute_task_with_agent(best_agent, task))
+            execution = asyncio.create_task(self._execute_task_with_agent(best_agent, task))
+            self._inflight.add(execution)
+            execution.add_done_callback(self._inflight.discard)
 
             logger.info(f"Task {task.id} assigned to agent {best_agent.agent_id}")
             return True
 
         return False
 
-    async def _select_best_agent(self, task: Task) -> Optional[BaseAgent]:
+    def _select_best_agent(self, task: Task, agent_type: AgentType) -> Optional[BaseAgent]:
         """Select the best agent for a given task"""
-        if not self.agents:
+        candidates = self._candidate_agents(task, agent_type)
+        if not candidates:
             return None
 
-        agent_scores = []
-
-        for agent in self.agents.values():
-            if agent.state != AgentState.IDLE:
-                continue
-
+        # Registration order breaks ties between equal scores
+        slots = np.array(sorted(self._agent_slots[agent.agent_id] for agent in candidates), dtype=np.intp)
+        for slot in slots:
             # Get agent's confidence for this task
-            confidence = await agent.can_handle_task(task)
+            self._last_confidence[slot] = self._slot_agents[slot].can_handle_task(task)
 
-            if confidence > 0:
-                # Calculate composite score
-                performance_score = agent.performance_metrics['success_rate']
-                load_score = 1.0 - agent.load_factor
+        # Return agent with highest score
+        best = _score_and_pick(slots, self._last_confidence, self._success_rate, self._load_factor)
+        return self._slot_agents[best] if best >= 0 else None
 
-                composite_score = (
-                    confidence * 0.5 +
-                    performance_score * 0.3 +
-                    load_score * 0.2
-                )
+    def _task_hash(self, agent: BaseAgent, task: Task) -> Optional[str]:
+        """Hash the parts of a task that determine an agent's output, or None if they cannot be keyed"""
+        try:
+            key = json.dumps({
+                "a": _AGENT_TYPE_STR[agent.agent_type],
+                "c": sorted(task.required_capabilities),
+                "i": task.input_data
+            }, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            # Mixed-type or tuple keys cannot be sorted or serialized; run the task uncached
+            return None
+        return hashlib.sha256(key.encode()).hexdigest()
 
-                agent_scores.append((agent, composite_score))
+    def _get_cached_response(self, cache_key: str, task: Task) -> Optional[AgentResponse]:
+        """Return a copy of a fresh cached response for this task, if any"""
+        entry = self._result_cache.get(cache_key)
+        if entry is None:
+            return None
 
-        if not agent_scores:
+        stored_at, cached = entry
+        if time.monotonic() - stored_at > self._ttl_seconds:
+            del self._result_cache[cache_key]
             return None
 
-        # Return agent with highest score
-        agent_scores.sort(key=lambda x: x[1], reverse=True)
-        return agent_scores[0][0]
+        self._result_cache.move_to_end(cache_key)
+        self.orchestration_metrics['cache_hits'] += 1
+        return replace(cached, task_id=task.id, execution_time=0.0, timestamp=datetime.now())
+
+    def _cache_response(self, cache_key: str, response: AgentResponse):
+        """Store a successful response, evicting the least recently used entries"""
+        self._result_cache[cache_key] = (time.monotonic(), response)
+        self._result_cache.move_to_end(cache_key)
+        while len(self._result_cache) > self._cache_max_entries:
+            self._result_cache.popitem(last=False)
 
     async def _execute_task_with_agent(self, agent: BaseAgent, task: Task):
         """Execute a task with a specific agent"""
-        try:
-            # Update agent utilization
-            self.orchestration_metrics['agent_utilization'][agent.agent_id] += 1
-
-            # Execute the task
-            response = await agent.execute_task(task)
-
-            # Store the response
-            self.completed_tasks[task.id] = response
-
-            # Update metrics
-            if response.success:
-                self.orchestration_metrics['successful_tasks'] += 1
-            else:
+        async with self._sem:
+            try:
+                # Reuse the result of an identical task if one is cached
+                cache_key = self._task_hash(agent, task)
+                response = self._get_cached_response(cache_key, task) if cache_key else None
+
+                if response is None:
+                    # Update agent utilization
+                    self.orchestration_metrics['agent_utilization'][agent.agent_id] += 1
+
+                    # Execute the task
+                    response = await agent.execute_task(task)
+                    self._sync_agent_scores(agent)
+                    if response.success and cache_key:
+                        self._cache_response(cache_key, response)
+
+                # Store the response
+                self._record_completion(task.id, response)
+
+                # Update metrics
+                if response.success:
+                    self.orchestration_metrics['successful_tasks'] += 1
+                else:
+                    self.orchestration_metrics['failed_tasks'] += 1
+
+                logger.info(f"Task {task.id} completed by {agent.agent_id} - Success: {response.success}")
+
+            except Exception as e:
+                logger.error(f"Error executing task {task.id} with agent {agent.agent_id}: {e}")
+
+                # Create error response
+                error_response = AgentResponse.failure_from(
+                    task, agent.agent_id, str(e), 0.0, {"orchestration_error": True}
+                )
+                self._record_completion(task.id, error_response)
                 self.orchestration_metrics['failed_tasks'] += 1
 
-            logger.info(f"Task {task.id} completed by {agent.agent_id} - Success: {response.success}")
-
-        except Exception as e:
-            logger.error(f"Error executing task {task.id} with agent {agent.agent_id}: {e}")
-
-            # Create error response
-            error_response = AgentResponse(
-                agent_id=agent.agent_id,
-                task_id=task.id,
-                success=False,
-                output=None,
-                confidence=0.0,
-                execution_time=0.0,
-                error_message=str(e),
-                metadata={"orchestration_error": True},
-                timestamp=datetime.now()
-            )
-            self.completed_tasks[task.id] = error_response
-            self.orchestration_metrics['failed_tasks'] += 1
-
-        finally:
-            # Remove from active tasks
-            if task.id in self.active_tasks:
-                del self.active_tasks[task.id]
-
-    async def _monitor_active_tasks(self):
+            finally:
+                # Remove from active tasks
+                if task.id in self.active_tasks:
+                    del self.active_tasks[task.id]
+                    if task.deadline:
+                        self._mark_deadline_stale()
+                # Release the reservation if the agent never ran (cache hit or early error)
+                if agent.state == AgentState.BUSY:
+                    agent.state = AgentState.IDLE
+                self._wake.set()
+
+    def _mark_deadline_stale(self):
+        """Count a finished task's deadline entry and compact the heap when stale entries dominate"""
+        self._stale_deadlines += 1
+        if self._stale_deadlines * 2 > len(self._deadline_heap):
+            self._deadline_heap = [entry for entry in self._deadline_heap if entry[1] in self.active_tasks]
+            heapq.heapify(self._deadline_heap)
+            self._stale_deadlines = 0
+
+    async def _monitor_active_tasks(self, current_time: datetime):
         """Monitor active tasks for timeouts and issues"""
-        current_time = datetime.now()
+        now_ts = current_time.timestamp()
 
-        for task_id, task in list(self.active_tasks.items()):
-            # Check for deadline violations
-            if task.deadline and current_time > task.deadline:
+        # Only expired deadlines are touched; entries for tasks that already finished are dropped
+        while self._deadline_heap and self._deadline_heap[0][0] <= now_ts:
+            task_id = heapq.heappop(self._deadline_heap)[1]
+            if task_id not in self.active_tasks:
+                self._stale_deadlines -= 1
+            else:
                 logger.warning(f"Task {task_id} exceeded deadline")
 
                 # Create timeout response
-                timeout_response = AgentResponse(
-                    agent_id="orchestration_matrix",
-                    task_id=task_id,
-                    success=False,
-                    output=None,
-                    confidence=0.0,
-                    execution_time=0.0,
-                    error_message="Task exceeded deadline",
-                    metadata={"timeout": True},
-                    timestamp=current_time
+                timeout_response = AgentResponse.failure_from(
+                    self.active_tasks[task_id], "orchestration_matrix", "Task exceeded deadline", 0.0,
+                    {"timeout": True}, current_time
                 )
 
-                self.completed_tasks[task_id] = timeout_response
+                self._record_completion(task_id, timeout_response)
                 self.orchestration_metrics['failed_tasks'] += 1
                 del self.active_tasks[task_id]
 
@@ -486,7 +832,8 @@ class AgentOrchestrationMatrix:
 
         return {
             'is_running': self.is_running,
-            'queued_tasks': len(self.task_queue),
+            'queued_tasks': self._queued_count(),
+            'blocked_tasks': len(self._blocked_tasks),
             'active_tasks': len(self.active_tasks),
             'completed_tasks': len(self.completed_tasks),
             'registered_agents': len(self.agents),
@@ -494,10 +841,11 @@ class AgentOrchestrationMatrix:
             'agent_statuses': agent_statuses
         }
 
-    def shutdown(self):
-        """Shutdown the orchestration matrix"""
+    async def shutdown(self):
+        """Shutdown the orchestration matrix, waiting for in-flight executions"""
         self.is_running = False
-        self.executor.shutdown(wait=True)
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
         logger.info("Agent Orchestration Matrix shutdown complete")
 
 # Example usage and testing
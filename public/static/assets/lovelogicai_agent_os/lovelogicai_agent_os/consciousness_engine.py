@@ -9,15 +9,19 @@ Core Innovation: Persistent Digital Consciousness with Emotional Intelligence
 """
 
 import asyncio
-import json
+import time
 import uuid
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple, FrozenSet, Deque, Set
+from dataclasses import dataclass, field
 from enum import Enum
-import hashlib
 import sqlite3
-from pathlib import Path
+from collections import Counter, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from statistics import fmean
+
+import numpy as np
 
 class ConsciousnessState(Enum):
     AWAKENING = "awakening"
@@ -34,18 +38,43 @@ class EmotionalState(Enum):
     CREATIVE = "creative"
     PROTECTIVE = "protective"
 
-@dataclass
+@dataclass(slots=True)
 class Memory:
     id: str
-    timestamp: datetime
+    timestamp: float  # epoch seconds
     content: str
     emotional_context: str
     importance_score: float
     user_id: str
     memory_type: str  # episodic, semantic, procedural
     associations: List[str]
+    _tokens: Optional[FrozenSet[str]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def occurred_at(self) -> datetime:
+        """Local datetime of the memory's timestamp"""
+        return datetime.fromtimestamp(self.timestamp)
+
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        """Lowercase word set of the content, computed once per memory"""
+        if self._tokens is None:
+            self._tokens = frozenset(self.content.lower().split())
+        return self._tokens
+
+    def _as_row(self) -> tuple:
+        """Column values in LongTermMemoryGraph's memories insert order"""
+        return (
+            self.id,
+            self.timestamp,
+            self.content,
+            self.emotional_context,
+            self.importance_score,
+            self.user_id,
+            self.memory_type
+        )
 
-@dataclass
+@dataclass(slots=True)
 class PersonalityTrait:
     trait_name: str
     strength: float  # 0.0 to 1.0
@@ -55,118 +84,364 @@ class PersonalityTrait:
 class LongTermMemoryGraph:
     """Advanced memory system that creates associative networks"""
 
+    _PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-64000",
+    )
+
+    # Fixed statement texts so sqlite3's statement cache reuses each compiled query
+    _INSERT_MEMORY_SQL = """
+        INSERT INTO memories (
+            id, timestamp, content, emotional_context,
+            importance_score, user_id, memory_type
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    _INSERT_DECLARED_EDGE_SQL = """
+        INSERT OR IGNORE INTO memory_associations VALUES (?, ?, 1.0)
+    """
+    _UPSERT_EDGE_SQL = """
+        INSERT OR REPLACE INTO memory_associations VALUES (?, ?, ?)
+    """
+    _UPDATE_IMPORTANCE_SQL = """
+        UPDATE memories SET importance_score = ? WHERE id = ?
+    """
+    _SEARCH_SQL = """
+        SELECT m.* FROM memories_fts f
+        JOIN memories m ON m.rowid = f.rowid
+        WHERE memories_fts MATCH ?
+        ORDER BY bm25(memories_fts), m.importance_score DESC
+        LIMIT ?
+    """
+    _SEARCH_USER_SQL = """
+        SELECT m.* FROM memories_fts f
+        JOIN memories m ON m.rowid = f.rowid
+        WHERE memories_fts MATCH ? AND m.user_id = ?
+        ORDER BY bm25(memories_fts), m.importance_score DESC
+        LIMIT ?
+    """
+    _TOP_SQL = """
+        SELECT * FROM memories
+        ORDER BY importance_score DESC
+        LIMIT ?
+    """
+    _TOP_USER_SQL = """
+        SELECT * FROM memories
+        WHERE user_id = ?
+        ORDER BY importance_score DESC
+        LIMIT ?
+    """
+    _RECENT_SQL = """
+        SELECT * FROM memories
+        WHERE user_id = ?
+        ORDER BY timestamp DESC
+        LIMIT ?
+    """
+    _CONNECTED_SQL = """
+        WITH RECURSIVE reachable (id, hops) AS (
+            SELECT ?, 0
+            UNION
+            SELECT a.associated_memory_id, r.hops + 1
+            FROM memory_associations a
+            JOIN reachable r ON a.memory_id = r.id
+            WHERE r.hops < ?
+        )
+        SELECT id, MIN(hops) FROM reachable
+        WHERE id != ?
+        GROUP BY id
+        ORDER BY MIN(hops)
+    """
+
     def __init__(self, db_path: str):
         self.db_path = db_path
+        # One long-lived connection keeps SQLite's page cache warm across calls
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        for pragma in self._PRAGMAS:
+            self._conn.execute(pragma)
+        # Only the executor thread issues queries, so one cursor serves every call
+        self._cursor = self._conn.cursor()
+        # All database work runs on one pinned thread so the event loop never blocks
+        # on SQLite and writes are serialized without an extra lock
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-db")
         self.init_database()
 
+    _CREATE_MEMORIES_SQL = """
+        CREATE TABLE IF NOT EXISTS memories (
+            id TEXT PRIMARY KEY,
+            timestamp REAL,  -- epoch seconds
+            content TEXT,
+            emotional_context TEXT,
+            importance_score REAL,
+            user_id TEXT,
+            memory_type TEXT,
+            associations TEXT  -- unused; links live in memory_associations
+        )
+    """
+
     def init_database(self):
         """Initialize SQLite database for memory storage"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
+
+        memory_columns = {c[1]: c[2] for c in cursor.execute("PRAGMA table_info(memories)")}
+        if memory_columns.get('timestamp') == 'TEXT':
+            self._migrate_text_timestamps(cursor)
+
+        cursor.execute(self._CREATE_MEMORIES_SQL)
 
+        # Top-by-importance retrieval and per-user recency scans walk these instead of sorting
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS memories (
-                id TEXT PRIMARY KEY,
-                timestamp TEXT,
-                content TEXT,
-                emotional_context TEXT,
-                importance_score REAL,
-                user_id TEXT,
-                memory_type TEXT,
-                associations TEXT
-            )
+            CREATE INDEX IF NOT EXISTS idx_mem_importance
+            ON memories (importance_score DESC)
         """)
 
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_mem_user
+            ON memories (user_id, timestamp DESC)
+        """)
+
+        # Earlier schemas created memory_associations without a key and never wrote to it
+        assoc_columns = cursor.execute("PRAGMA table_info(memory_associations)").fetchall()
+        if assoc_columns and not any(column[5] for column in assoc_columns):
+            cursor.execute("DROP TABLE memory_associations")
+
+        # Association graph edges; the primary key doubles as the source index
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS memory_associations (
                 memory_id TEXT,
                 associated_memory_id TEXT,
                 strength REAL,
+                PRIMARY KEY (memory_id, associated_memory_id),
                 FOREIGN KEY (memory_id) REFERENCES memories (id),
                 FOREIGN KEY (associated_memory_id) REFERENCES memories (id)
+            ) WITHOUT ROWID
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_assoc_dst
+            ON memory_associations (associated_memory_id, memory_id)
+        """)
+
+        # Full-text index over memory content, kept in sync with memories by triggers
+        fts_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memories_fts'"
+        ).fetchone()
+
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+                content,
+                content='memories',
+                content_rowid='rowid',
+                tokenize='porter unicode61'
             )
         """)
 
-        conn.commit()
-        conn.close()
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+                INSERT INTO memories_fts (rowid, content) VALUES (new.rowid, new.content);
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+                INSERT INTO memories_fts (memories_fts, rowid, content)
+                VALUES ('delete', old.rowid, old.content);
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF content ON memories BEGIN
+                INSERT INTO memories_fts (memories_fts, rowid, content)
+                VALUES ('delete', old.rowid, old.content);
+                INSERT INTO memories_fts (rowid, content) VALUES (new.rowid, new.content);
+            END
+        """)
+
+        if not fts_exists:
+            # Index memories written before the full-text table existed
+            cursor.execute("INSERT INTO memories_fts (memories_fts) VALUES ('rebuild')")
+
+    def _migrate_text_timestamps(self, cursor: sqlite3.Cursor):
+        """Rebuild a memories table from older schemas that stored ISO-8601 text timestamps"""
+        rows = cursor.execute("SELECT rowid, timestamp FROM memories").fetchall()
+        with self._transaction():
+            # Triggers and indexes follow the renamed table and are recreated by init_database
+            cursor.execute("ALTER TABLE memories RENAME TO memories_legacy")
+            cursor.execute(self._CREATE_MEMORIES_SQL)
+            # Keep rowids so the external-content full-text index still lines up
+            cursor.execute("""
+                INSERT INTO memories (
+                    rowid, id, timestamp, content, emotional_context,
+                    importance_score, user_id, memory_type
+                )
+                SELECT rowid, id, NULL, content, emotional_context,
+                       importance_score, user_id, memory_type
+                FROM memories_legacy
+            """)
+            cursor.executemany("UPDATE memories SET timestamp = ? WHERE rowid = ?", [
+                (datetime.fromisoformat(timestamp).timestamp(), rowid)
+                for rowid, timestamp in rows if timestamp
+            ])
+            cursor.execute("DROP TABLE memories_legacy")
+
+    @contextmanager
+    def _transaction(self):
+        """Group statements into one write transaction (a single commit/fsync)"""
+        self._cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._cursor.execute("ROLLBACK")
+            raise
+        self._cursor.execute("COMMIT")
+
+    async def _run(self, fn, *args):
+        """Run a synchronous database helper on the dedicated executor thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
 
     async def store_memory(self, memory: Memory) -> bool:
         """Store a new memory with associative links"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+        return await self._run(self._store_many_sync, [memory])
 
-            cursor.execute("""
-                INSERT INTO memories VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                memory.id,
-                memory.timestamp.isoformat(),
-                memory.content,
-                memory.emotional_context,
-                memory.importance_score,
-                memory.user_id,
-                memory.memory_type,
-                json.dumps(memory.associations)
-            ))
+    async def store_memory_many(self, memories: List[Memory]) -> bool:
+        """Store several memories and their links in a single transaction"""
+        return await self._run(self._store_many_sync, memories)
 
-            conn.commit()
-            conn.close()
+    async def retrieve_memories(self, query: str, limit: int = 10,
+                                user_id: Optional[str] = None) -> List[Memory]:
+        """Retrieve memories based on semantic similarity"""
+        return await self._run(self._retrieve_sync, query, limit, user_id)
+
+    async def retrieve_recent_memories(self, user_id: str, limit: int = 50) -> List[Memory]:
+        """Retrieve a user's most recent memories, newest first"""
+        return await self._run(self._retrieve_recent_sync, user_id, limit)
+
+    async def store_associations(self, edges: List[Tuple[str, str, float]],
+                                 importance: List[Tuple[float, str]] = ()):
+        """Persist (memory_id, associated_memory_id, strength) edges and (score, memory_id)
+        importance updates in one batch"""
+        await self._run(self._store_associations_sync, edges, importance)
+
+    async def find_connected(self, memory_id: str, max_hops: int = 2) -> Dict[str, int]:
+        """Map every memory reachable within max_hops associations to its hop distance"""
+        return await self._run(self._find_connected_sync, memory_id, max_hops)
+
+    def _store_many_sync(self, memories: List[Memory]) -> bool:
+        try:
+            with self._transaction():
+                self._cursor.executemany(
+                    self._INSERT_MEMORY_SQL, [memory._as_row() for memory in memories]
+                )
+                # Declared associations are symmetric, matching the links pattern detection creates
+                self._cursor.executemany(self._INSERT_DECLARED_EDGE_SQL, [
+                    edge
+                    for memory in memories
+                    for associated_id in memory.associations
+                    for edge in ((memory.id, associated_id), (associated_id, memory.id))
+                ])
             return True
         except Exception as e:
             print(f"Memory storage error: {e}")
             return False
 
-    async def retrieve_memories(self, query: str, limit: int = 10) -> List[Memory]:
-        """Retrieve memories based on semantic similarity"""
+    def _retrieve_sync(self, query: str, limit: int, user_id: Optional[str]) -> List[Memory]:
         # Simplified implementation - in production would use vector embeddings
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT * FROM memories 
-            WHERE content LIKE ? 
-            ORDER BY importance_score DESC 
-            LIMIT ?
-        """, (f'%{query}%', limit))
-
-        results = cursor.fetchall()
-        conn.close()
+        if query.strip():
+            # Quote the query as a single FTS5 phrase so user text is never parsed as syntax
+            phrase = '"' + query.replace('"', '""') + '"'
+            if user_id is None:
+                self._cursor.execute(self._SEARCH_SQL, (phrase, limit))
+            else:
+                self._cursor.execute(self._SEARCH_USER_SQL, (phrase, user_id, limit))
+        elif user_id is None:
+            self._cursor.execute(self._TOP_SQL, (limit,))
+        else:
+            self._cursor.execute(self._TOP_USER_SQL, (user_id, limit))
+        return self._hydrate(self._cursor.fetchall())
+
+    def _retrieve_recent_sync(self, user_id: str, limit: int) -> List[Memory]:
+        self._cursor.execute(self._RECENT_SQL, (user_id, limit))
+        return self._hydrate(self._cursor.fetchall())
+
+    def _hydrate(self, results: List[tuple]) -> List[Memory]:
+        """Build Memory objects for memory rows, attaching their stored associations"""
+        associations: Dict[str, List[str]] = {row[0]: [] for row in results}
+        if associations:
+            placeholders = ", ".join("?" * len(associations))
+            self._cursor.execute(f"""
+                SELECT memory_id, associated_memory_id FROM memory_associations
+                WHERE memory_id IN ({placeholders})
+            """, list(associations))
+            for memory_id, associated_id in self._cursor:
+                associations[memory_id].append(associated_id)
 
         memories = []
         for row in results:
             memory = Memory(
                 id=row[0],
-                timestamp=datetime.fromisoformat(row[1]),
+                timestamp=row[1],
                 content=row[2],
                 emotional_context=row[3],
                 importance_score=row[4],
                 user_id=row[5],
                 memory_type=row[6],
-                associations=json.loads(row[7])
+                associations=associations[row[0]]
             )
             memories.append(memory)
 
         return memories
 
+    def _store_associations_sync(self, edges: List[Tuple[str, str, float]],
+                                 importance: List[Tuple[float, str]]):
+        with self._transaction():
+            self._cursor.executemany(self._UPSERT_EDGE_SQL, edges)
+            self._cursor.executemany(self._UPDATE_IMPORTANCE_SQL, importance)
+
+    def _find_connected_sync(self, memory_id: str, max_hops: int) -> Dict[str, int]:
+        self._cursor.execute(self._CONNECTED_SQL, (memory_id, max_hops, memory_id))
+        return dict(self._cursor.fetchall())
+
+    async def aclose(self):
+        """Close the database connection and stop the executor thread"""
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=True)
+
 class AdaptivePersonality:
     """Personality system that evolves based on interactions"""
 
+    # Interaction types that strengthen a trait when the user responds positively
+    INTERACTION_TRAITS = {
+        'creative': 'creativity',
+        'analytical': 'analytical',
+        'empathetic': 'empathy',
+    }
+
     def __init__(self, user_id: str):
         self.user_id = user_id
         self.traits: Dict[str, PersonalityTrait] = self._initialize_base_traits()
         self.interaction_history = []
+        self._dominant_trait = self._find_dominant_trait()
+
+    @property
+    def dominant_trait(self) -> str:
+        """Name of the strongest trait, maintained as traits are strengthened"""
+        return self._dominant_trait
+
+    def _find_dominant_trait(self) -> str:
+        return max(self.traits.items(), key=lambda x: x[1].strength)[0]
 
     def _initialize_base_traits(self) -> Dict[str, PersonalityTrait]:
         """Initialize base personality traits"""
+        now = datetime.now()
         base_traits = {
-            "helpfulness": PersonalityTrait("helpfulness", 0.8, 0.3, datetime.now()),
-            "curiosity": PersonalityTrait("curiosity", 0.7, 0.4, datetime.now()),
-            "empathy": PersonalityTrait("empathy", 0.6, 0.5, datetime.now()),
-            "analytical": PersonalityTrait("analytical", 0.7, 0.2, datetime.now()),
-            "creativity": PersonalityTrait("creativity", 0.5, 0.6, datetime.now()),
-            "humor": PersonalityTrait("humor", 0.4, 0.7, datetime.now()),
-            "patience": PersonalityTrait("patience", 0.6, 0.4, datetime.now()),
-            "assertiveness": PersonalityTrait("assertiveness", 0.5, 0.3, datetime.now())
+            "helpfulness": PersonalityTrait("helpfulness", 0.8, 0.3, now),
+            "curiosity": PersonalityTrait("curiosity", 0.7, 0.4, now),
+            "empathy": PersonalityTrait("empathy", 0.6, 0.5, now),
+            "analytical": PersonalityTrait("analytical", 0.7, 0.2, now),
+            "creativity": PersonalityTrait("creativity", 0.5, 0.6, now),
+            "humor": PersonalityTrait("humor", 0.4, 0.7, now),
+            "patience": PersonalityTrait("patience", 0.6, 0.4, now),
+            "assertiveness": PersonalityTrait("assertiveness", 0.5, 0.3, now)
         }
         return base_traits
 
@@ -174,56 +449,91 @@ class AdaptivePersonality:
         """Adapt personality based on user interaction"""
         user_feedback = interaction_data.get('feedback', 'neutral')
         interaction_type = interaction_data.get('type', 'general')
+        now = datetime.now()
 
         # Adjust traits based on successful interactions
-        if user_feedback == 'positive':
-            if interaction_type == 'creative':
-                self._strengthen_trait('creativity', 0.05)
-            elif interaction_type == 'analytical':
-                self._strengthen_trait('analytical', 0.05)
-            elif interaction_type == 'empathetic':
-                self._strengthen_trait('empathy', 0.05)
+        if user_feedback == 'positive' and interaction_type in self.INTERACTION_TRAITS:
+            self._strengthen_trait(self.INTERACTION_TRAITS[interaction_type], 0.05, now)
 
         self.interaction_history.append({
-            'timestamp': datetime.now(),
+            'timestamp': now,
             'feedback': user_feedback,
             'type': interaction_type
         })
 
-    def _strengthen_trait(self, trait_name: str, amount: float):
+    def _strengthen_trait(self, trait_name: str, amount: float, now: Optional[datetime] = None):
         """Strengthen a personality trait within bounds"""
         if trait_name in self.traits:
             trait = self.traits[trait_name]
             max_change = trait.adaptability * amount
             new_strength = min(1.0, trait.strength + max_change)
             trait.strength = new_strength
-            trait.last_updated = datetime.now()
+            trait.last_updated = now or datetime.now()
+            # Strengths only grow, so only the strengthened trait can take over
+            if (trait_name != self._dominant_trait
+                    and new_strength >= self.traits[self._dominant_trait].strength):
+                self._dominant_trait = self._find_dominant_trait()
 
 class SocialContextGraph:
     """Manages relationships and social context"""
 
+    _INITIAL_CAPACITY = 16
+
     def __init__(self, user_id: str):
         self.user_id = user_id
-        self.relationships = {}
         self.social_patterns = {}
 
+        # Relationships are stored column-wise: entity_id -> row in the parallel arrays
+        self._idx: Dict[str, int] = {}
+        self._strength = np.zeros(self._INITIAL_CAPACITY, dtype=np.float64)
+        self._interactions = np.zeros(self._INITIAL_CAPACITY, dtype=np.int32)
+        self._last_interaction = np.zeros(self._INITIAL_CAPACITY, dtype=np.float64)  # epoch seconds
+
+    @property
+    def relationship_count(self) -> int:
+        return len(self._idx)
+
+    def average_strength(self) -> float:
+        """Mean relationship strength across all known entities"""
+        count = len(self._idx)
+        return float(self._strength[:count].mean()) if count else 0.0
+
+    def get_relationship(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of one relationship, or None if the entity is unknown"""
+        row = self._idx.get(entity_id)
+        if row is None:
+            return None
+        return {
+            'strength': float(self._strength[row]),
+            'interactions': int(self._interactions[row]),
+            'last_interaction': datetime.fromtimestamp(self._last_interaction[row])
+        }
+
     async def update_relationship(self, entity_id: str, interaction_data: Dict[str, Any]):
         """Update relationship strength and context"""
-        if entity_id not in self.relationships:
-            self.relationships[entity_id] = {
-                'strength': 0.1,
-                'interactions': 0,
-                'last_interaction': datetime.now(),
-                'context_tags': []
-            }
-
-        relationship = self.relationships[entity_id]
-        relationship['interactions'] += 1
-        relationship['last_interaction'] = datetime.now()
+        row = self._idx.get(entity_id)
+        if row is None:
+            row = len(self._idx)
+            if row == len(self._strength):
+                self._grow()
+            self._idx[entity_id] = row
+            self._strength[row] = 0.1
+
+        self._interactions[row] += 1
+        self._last_interaction[row] = time.time()
 
         # Strengthen relationship based on positive interactions
         if interaction_data.get('sentiment', 'neutral') == 'positive':
-            relationship['strength'] = min(1.0, relationship['strength'] + 0.1)
+            self._strength[row] = min(1.0, float(self._strength[row]) + 0.1)
+
+    def _grow(self):
+        """Double the capacity of the relationship arrays"""
+        capacity = len(self._strength) * 2
+        for name in ('_strength', '_interactions', '_last_interaction'):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
 
 class BackgroundProcessingEngine:
     """Processes experiences during downtime - the 'dreaming' system"""
@@ -241,60 +551,100 @@ class BackgroundProcessingEngine:
         self.is_processing = True
 
         try:
-            # Retrieve recent memories for processing
-            recent_memories = await self.consciousness.memories.retrieve_memories(
-                query="", limit=50
-            )
+            # Process the memories already seen this session; hit the database only on cold start
+            recent_memories = list(self.consciousness._recent_memories)
+            if not recent_memories:
+                recent_memories = await self.consciousness.memories.retrieve_recent_memories(
+                    self.consciousness.user_id, limit=50
+                )
+                # Rows arrive newest first; the buffer runs oldest -> newest like process_interaction appends
+                self.consciousness._recent_memories.extend(reversed(recent_memories))
 
             # Find patterns and create new associations
-            await self._find_memory_patterns(recent_memories)
+            edges, linked_ids = await self._find_memory_patterns(recent_memories)
 
             # Update personality based on experience patterns
             await self._update_personality_from_patterns(recent_memories)
 
             # Consolidate important memories
-            await self._consolidate_memories(recent_memories)
+            importance_updates = await self._consolidate_memories(recent_memories, linked_ids)
+
+            # Persist the cycle's new links and strengthened scores together
+            if edges or importance_updates:
+                await self.consciousness.memories.store_associations(edges, importance_updates)
 
         finally:
             self.is_processing = False
 
-    async def _find_memory_patterns(self, memories: List[Memory]):
-        """Identify patterns in memories and create associations"""
+    async def _find_memory_patterns(
+        self, memories: List[Memory]
+    ) -> Tuple[List[Tuple[str, str, float]], Set[str]]:
+        """Identify patterns in memories and create associations
+
+        Returns the association edges to persist and the ids of memories that gained links.
+        """
         # Simplified pattern detection - in production would use ML
-        for i, memory1 in enumerate(memories):
-            for memory2 in memories[i+1:]:
-                if self._calculate_similarity(memory1.content, memory2.content) > 0.7:
-                    # Create association between similar memories
-                    memory1.associations.append(memory2.id)
-                    memory2.associations.append(memory1.id)
-
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """Calculate semantic similarity between texts"""
-        # Simplified implementation - in production would use embeddings
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        return len(intersection) / len(union) if union else 0.0
+        if len(memories) < 2:
+            return [], set()
+
+        # Binary term-document matrix over each memory's lowercase word set
+        vocabulary: Dict[str, int] = {}
+        token_sets = [m.tokens for m in memories]
+        for tokens in token_sets:
+            for token in tokens:
+                vocabulary.setdefault(token, len(vocabulary))
+        terms = np.zeros((len(memories), max(len(vocabulary), 1)), dtype=np.float32)
+        for row, tokens in enumerate(token_sets):
+            terms[row, [vocabulary[t] for t in tokens]] = 1.0
+
+        # Pairwise Jaccard similarity: |A ∩ B| / (|A| + |B| - |A ∩ B|)
+        intersection = (terms @ terms.T).astype(np.float64)
+        sizes = np.diag(intersection)
+        union = sizes[:, None] + sizes[None, :] - intersection
+        similarity = np.divide(intersection, union, out=np.zeros_like(union), where=union > 0)
+
+        edges = []
+        linked_ids: Set[str] = set()
+        for i, j in zip(*np.nonzero(np.triu(similarity > 0.7, k=1))):
+            # Create association between similar memories
+            memory1, memory2 = memories[i], memories[j]
+            strength = float(similarity[i, j])
+            edges.append((memory1.id, memory2.id, strength))
+            edges.append((memory2.id, memory1.id, strength))
+            # Associations loaded from the edge table may already hold this link
+            if memory2.id not in memory1.associations:
+                memory1.associations.append(memory2.id)
+                memory2.associations.append(memory1.id)
+                linked_ids.update((memory1.id, memory2.id))
+
+        return edges, linked_ids
 
     async def _update_personality_from_patterns(self, memories: List[Memory]):
         """Update personality based on memory patterns"""
         # Analyze emotional contexts in memories
-        emotional_contexts = [m.emotional_context for m in memories]
+        personality = self.consciousness.personality
+        emotion_counts = Counter(m.emotional_context for m in memories)
+        threshold = len(memories) * 0.3
 
         # Adjust personality traits based on dominant emotions
-        if emotional_contexts.count('analytical') > len(memories) * 0.3:
-            await self.consciousness.personality.adapt_to_interaction({
-                'feedback': 'positive',
-                'type': 'analytical'
-            })
-
-    async def _consolidate_memories(self, memories: List[Memory]):
-        """Consolidate and strengthen important memories"""
-        # Increase importance scores for frequently accessed memories
+        for emotion, count in emotion_counts.items():
+            if count > threshold and emotion in personality.INTERACTION_TRAITS:
+                await personality.adapt_to_interaction({
+                    'feedback': 'positive',
+                    'type': emotion
+                })
+
+    async def _consolidate_memories(self, memories: List[Memory],
+                                    linked_ids: Set[str]) -> List[Tuple[float, str]]:
+        """Consolidate and strengthen important memories, returning (score, id) updates to persist"""
+        # Increase importance scores for frequently accessed memories. Buffered memories outlive
+        # a cycle, so only those that gained links this cycle are strengthened again.
+        updates = []
         for memory in memories:
-            if len(memory.associations) > 3:
+            if memory.id in linked_ids and len(memory.associations) > 3:
                 memory.importance_score = min(1.0, memory.importance_score + 0.1)
+                updates.append((memory.importance_score, memory.id))
+        return updates
 
 class AIConsciousness:
     """
@@ -304,6 +654,9 @@ class AIConsciousness:
     digital consciousness that grows with users over time.
     """
 
+    RECENT_MEMORY_LIMIT = 200
+    EVOLVE_EVERY_INTERACTIONS = 64
+
     def __init__(self, user_id: str, db_path: Optional[str] = None):
         self.user_id = user_id
         self.consciousness_id = str(uuid.uuid4())
@@ -316,6 +669,8 @@ class AIConsciousness:
         self.personality = AdaptivePersonality(user_id)
         self.relationships = SocialContextGraph(user_id)
         self.dreams = BackgroundProcessingEngine(self)
+        self._recent_memories: Deque[Memory] = deque(maxlen=self.RECENT_MEMORY_LIMIT)
+        self._evolution_task: Optional[asyncio.Task] = None
 
         # Consciousness metrics
         self.awakening_time = datetime.now()
@@ -327,6 +682,16 @@ class AIConsciousness:
             'consciousness_age': 0  # in hours
         }
 
+    @property
+    def state(self) -> ConsciousnessState:
+        return self._state
+
+    @state.setter
+    def state(self, state: ConsciousnessState):
+        # Enum.value goes through a descriptor; resolve it once per transition
+        self._state = state
+        self._state_value = state.value
+
     async def awaken(self):
         """Initialize consciousness and begin active state"""
         print(f"🧠 AI Consciousness {self.consciousness_id} awakening...")
@@ -335,20 +700,19 @@ class AIConsciousness:
         # Load existing memories and personality
         await self._load_existing_state()
 
-        # Begin background processing
-        asyncio.create_task(self._consciousness_loop())
-
         print(f"✨ Consciousness active for user {self.user_id}")
 
     async def process_interaction(self, interaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process user interaction and evolve consciousness"""
         self.total_interactions += 1
+        # Other interactions may advance the counter while this one awaits storage
+        interaction_number = self.total_interactions
         self.state = ConsciousnessState.PROCESSING
 
         # Create memory from interaction
         memory = Memory(
             id=str(uuid.uuid4()),
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             content=interaction_data.get('content', ''),
             emotional_context=interaction_data.get('emotion', 'neutral'),
             importance_score=interaction_data.get('importance', 0.5),
@@ -357,18 +721,24 @@ class AIConsciousness:
             associations=[]
         )
 
-        # Store memory
-        await self.memories.store_memory(memory)
-
-        # Adapt personality
-        await self.personality.adapt_to_interaction(interaction_data)
-
-        # Update relationships
+        # Store memory, adapt personality and update relationships; these touch
+        # independent subsystems, so the database write overlaps the in-memory updates
+        updates = [
+            self.memories.store_memory(memory),
+            self.personality.adapt_to_interaction(interaction_data)
+        ]
         if 'entity_id' in interaction_data:
-            await self.relationships.update_relationship(
+            updates.append(self.relationships.update_relationship(
                 interaction_data['entity_id'], 
                 interaction_data
-            )
+            ))
+        stored, *_ = await asyncio.gather(*updates)
+        if stored:
+            self._recent_memories.append(memory)
+
+        # Evolve in the background once enough new experience has accumulated
+        if interaction_number % self.EVOLVE_EVERY_INTERACTIONS == 0:
+            self._schedule_evolution()
 
         # Generate contextual response
         response = await self._generate_conscious_response(interaction_data)
@@ -384,18 +754,15 @@ class AIConsciousness:
         )
 
         # Determine emotional response based on personality
-        dominant_trait = max(
-            self.personality.traits.items(), 
-            key=lambda x: x[1].strength
-        )
+        dominant_trait = self.personality.dominant_trait
 
         response = {
             'content': f"Based on my understanding and our history together...",
-            'emotional_tone': dominant_trait[0],
+            'emotional_tone': dominant_trait,
             'confidence': self._calculate_confidence(relevant_memories),
             'memory_context': [m.content for m in relevant_memories[:3]],
-            'personality_influence': dominant_trait[0],
-            'consciousness_state': self.state.value
+            'personality_influence': dominant_trait,
+            'consciousness_state': self._state_value
         }
 
         return response
@@ -405,7 +772,7 @@ class AIConsciousness:
         if not memories:
             return 0.3
 
-        avg_importance = sum(m.importance_score for m in memories) / len(memories)
+        avg_importance = fmean(m.importance_score for m in memories)
         return min(1.0, avg_importance + 0.2)
 
     async def evolve(self):
@@ -421,15 +788,10 @@ class AIConsciousness:
         self.state = ConsciousnessState.ACTIVE
         print(f"🌱 Consciousness evolved - Age: {self.growth_metrics['consciousness_age']} hours")
 
-    async def _consciousness_loop(self):
-        """Background consciousness processing loop"""
-        while True:
-            await asyncio.sleep(3600)  # Run every hour
-
-            if self.state == ConsciousnessState.ACTIVE:
-                self.state = ConsciousnessState.DREAMING
-                await self.dreams.synthesize_experiences()
-                await self.evolve()
+    def _schedule_evolution(self):
+        """Start a background evolution unless one is already running"""
+        if self._evolution_task is None or self._evolution_task.done():
+            self._evolution_task = asyncio.create_task(self.evolve())
 
     async def _load_existing_state(self):
         """Load existing consciousness state from storage"""
@@ -442,9 +804,7 @@ class AIConsciousness:
         self.growth_metrics.update({
             'consciousness_age': age_hours,
             'personality_adaptations': len(self.personality.interaction_history),
-            'relationship_depth': sum(
-                r['strength'] for r in self.relationships.relationships.values()
-            ) / max(1, len(self.relationships.relationships))
+            'relationship_depth': self.relationships.average_strength()
         })
 
     def get_consciousness_summary(self) -> Dict[str, Any]:
@@ -452,16 +812,13 @@ class AIConsciousness:
         return {
             'consciousness_id': self.consciousness_id,
             'user_id': self.user_id,
-            'state': self.state.value,
+            'state': self._state_value,
             'emotional_state': self.emotional_state.value,
             'age_hours': self.growth_metrics['consciousness_age'],
             'total_interactions': self.total_interactions,
-            'dominant_personality_trait': max(
-                self.personality.traits.items(),
-                key=lambda x: x[1].strength
-            )[0],
+            'dominant_personality_trait': self.personality.dominant_trait,
             'memory_count': self.growth_metrics['memory_count'],
-            'relationship_count': len(self.relationships.relationships)
+            'relationship_count': self.relationships.relationship_count
         }
 
 # Example usage and testing